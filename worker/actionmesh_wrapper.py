@@ -7,10 +7,14 @@ This module handles frame extraction, ActionMesh invocation, and output manageme
 
 import os
 import sys
+import json
+import contextlib
 import subprocess
 import shutil
+import threading
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 
 # Add ActionMesh repo to path if available
@@ -18,21 +22,89 @@ ACTIONMESH_REPO = Path(__file__).parent / "actionmesh_repo"
 if ACTIONMESH_REPO.exists():
     sys.path.insert(0, str(ACTIONMESH_REPO))
 
+# Environment for the inference script subprocess, built once
+_ACTIONMESH_ENV = {**os.environ, "PYTHONPATH": str(ACTIONMESH_REPO)}
+
+# Prefer calling ActionMesh in-process when it is installed as a package.
+# Newer versions also accept decoded frames directly, which skips the
+# PNG round-trip through disk entirely.
+try:
+    import actionmesh.inference as _actionmesh_inference
+except ImportError:
+    _actionmesh_inference = None
+
+_HAS_DIRECT = hasattr(_actionmesh_inference, "run_inference")
+_HAS_TENSOR_INPUT = hasattr(_actionmesh_inference, "run_inference_tensor")
+_HAS_BATCH = hasattr(_actionmesh_inference, "run_inference_batch")
+
+# Whether run_actionmesh can take frames decoded in memory (see decode_video_frames)
+SUPPORTS_FRAME_INPUT = _HAS_DIRECT and _HAS_TENSOR_INPUT
+
+# Whether run_actionmesh_batch runs jobs through the model together rather
+# than one after another
+SUPPORTS_BATCH = _HAS_BATCH
+
+# Input files run_actionmesh treats as videos rather than frame directories
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".avi", ".webm")
+
+# Number of subprocess output lines kept for error messages
+OUTPUT_TAIL_LINES = 200
+
+# Opt-in: run in-process ActionMesh under inference mode with BF16/FP16
+# autocast. This covers the whole pipeline, including mesh extraction and
+# export, so it is off unless the installed version is known to handle it
+AUTOCAST = os.getenv("ACTIONMESH_AUTOCAST", "0") == "1"
+
+
+def _run_streaming(
+    cmd: list,
+    env: Optional[dict] = None,
+    on_line: Optional[Callable[[str], bool]] = None,
+) -> tuple[int, str]:
+    """
+    Run a command, streaming its combined stdout/stderr line by line.
+    
+    Output is consumed as it is produced instead of being buffered in full.
+    Lines for which on_line returns True are treated as progress and are not
+    kept; the last OUTPUT_TAIL_LINES other lines are returned with the exit code.
+    """
+    tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        env=env,
+    ) as proc:
+        for line in proc.stdout:
+            line = line.rstrip()
+            if on_line and on_line(line):
+                continue
+            tail.append(line)
+    
+    return proc.returncode, "\n".join(tail)
+
 
 def extract_frames_from_video(
     video_path: str,
     output_dir: str,
     max_frames: int = 31,
     target_fps: Optional[float] = None,
+    on_progress: Optional[Callable[[str], None]] = None,
 ) -> int:
     """
     Extract frames from a video file using ffmpeg.
     
+    ffmpeg stops reading the input once max_frames frames have been written,
+    so only the start of a long clip is ever decoded.
+    
     Args:
         video_path: Path to the input video file (MP4, MOV, etc.)
         output_dir: Directory to save extracted PNG frames
         max_frames: Maximum number of frames to extract (default 31, ActionMesh limit)
         target_fps: Target FPS for extraction. If None, extracts all frames up to max_frames.
+        on_progress: Optional callback receiving progress messages
     
     Returns:
         Number of frames extracted
@@ -47,7 +119,12 @@ def extract_frames_from_video(
     # Output format: 000.png, 001.png, etc. (3-digit padding for ActionMesh compatibility)
     output_pattern = str(output_path / "%03d.png")
     
-    cmd = ["ffmpeg", "-y", "-i", video_path]
+    # Machine-readable progress goes to stdout, errors only to stderr
+    cmd = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-nostats", "-progress", "pipe:1",
+        "-i", video_path,
+    ]
     
     if target_fps:
         cmd.extend(["-vf", f"fps={target_fps}"])
@@ -59,21 +136,23 @@ def extract_frames_from_video(
         output_pattern,
     ])
     
+    def on_line(line: str) -> bool:
+        # -progress emits key=value lines; errors are free text
+        key, sep, value = line.partition("=")
+        if on_progress and key == "frame":
+            on_progress(f"Extracted {value} frames")
+        return bool(sep) and " " not in key
+    
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-        )
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"ffmpeg failed: {e.stderr}")
+        returncode, output = _run_streaming(cmd, on_line=on_line)
     except FileNotFoundError:
         raise RuntimeError("ffmpeg not found. Please install ffmpeg.")
     
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {output}")
+    
     # Count extracted frames
-    frame_files = list(output_path.glob("*.png"))
-    frame_count = len(frame_files)
+    frame_count = count_png_frames(output_path)
     
     if frame_count == 0:
         raise RuntimeError("No frames extracted from video")
@@ -82,12 +161,211 @@ def extract_frames_from_video(
     return frame_count
 
 
-def validate_frame_count(input_dir: str) -> int:
+def probe_video_size(video_path: str) -> tuple[int, int]:
+    """
+    Get the display width and height of a video's first stream using ffprobe.
+    
+    Accounts for rotation metadata, since ffmpeg auto-rotates decoded frames.
+    
+    Raises:
+        RuntimeError: If ffprobe fails or the file has no video stream
+    """
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream=width,height:stream_tags=rotate:stream_side_data=rotation",
+        "-of", "json",
+        video_path,
+    ]
+    
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"ffprobe failed: {e.stderr}")
+    except FileNotFoundError:
+        raise RuntimeError("ffprobe not found. Please install ffmpeg.")
+    
+    streams = json.loads(result.stdout).get("streams", [])
+    if not streams:
+        raise RuntimeError(f"No video stream found in {video_path}")
+    
+    stream = streams[0]
+    width, height = int(stream["width"]), int(stream["height"])
+    
+    rotation = stream.get("tags", {}).get("rotate", 0)
+    for side_data in stream.get("side_data_list", []):
+        rotation = side_data.get("rotation", rotation)
+    if abs(int(rotation)) % 180 == 90:
+        width, height = height, width
+    
+    return width, height
+
+
+def count_video_frames(video_path: str, max_frames: Optional[int] = None) -> int:
+    """
+    Count the frames in a video's first stream using ffprobe.
+    
+    Counts packets rather than decoding, so it only has to read the container.
+    With max_frames, ffprobe stops reading after that many packets, so a long
+    clip costs no more than a short one; the result is then capped at max_frames.
+    
+    Raises:
+        RuntimeError: If ffprobe fails or the file has no video stream
+    """
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-count_packets",
+    ]
+    
+    if max_frames:
+        cmd.extend(["-read_intervals", f"%+#{max_frames}"])
+    
+    cmd.extend([
+        "-show_entries", "stream=nb_read_packets",
+        "-of", "csv=p=0",
+        video_path,
+    ])
+    
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"ffprobe failed: {e.stderr}")
+    except FileNotFoundError:
+        raise RuntimeError("ffprobe not found. Please install ffmpeg.")
+    
+    count = result.stdout.strip().rstrip(",")
+    if not count:
+        raise RuntimeError(f"No video stream found in {video_path}")
+    if max_frames:
+        return min(int(count), max_frames)
+    return int(count)
+
+
+def decode_video_frames(
+    video_path: str,
+    max_frames: int = 31,
+    target_fps: Optional[float] = None,
+    pin_memory: bool = False,
+):
+    """
+    Decode frames from a video straight into memory using a single ffmpeg pipe.
+    
+    Unlike extract_frames_from_video, no PNGs are written: ffmpeg emits raw
+    RGB24 frames on stdout which are read directly into a preallocated array.
+    
+    Args:
+        video_path: Path to the input video file (MP4, MOV, etc.)
+        max_frames: Maximum number of frames to decode (default 31, ActionMesh limit)
+        target_fps: Target FPS for extraction. If None, decodes all frames up to max_frames.
+        pin_memory: Decode into page-locked memory when torch and CUDA are
+                    available, so the copy to the GPU can run asynchronously
+    
+    Returns:
+        uint8 numpy array of shape (num_frames, height, width, 3)
+    
+    Raises:
+        RuntimeError: If ffmpeg fails or no frames are decoded
+    """
+    width, height = probe_video_size(video_path)
+    frame_size = width * height * 3
+    
+    cmd = ["ffmpeg", "-loglevel", "error", "-i", video_path]
+    
+    if target_fps:
+        cmd.extend(["-vf", f"fps={target_fps}"])
+    
+    cmd.extend([
+        "-frames:v", str(max_frames),
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "pipe:1",
+    ])
+    
+    frames = _alloc_frame_buffer((max_frames, height, width, 3), pin_memory)
+    frame_count = 0
+    
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+        )
+    except FileNotFoundError:
+        raise RuntimeError("ffmpeg not found. Please install ffmpeg.")
+    
+    # Drain stderr concurrently, keeping only the tail: a corrupt stream can
+    # produce more errors than the pipe buffers, which would block ffmpeg
+    # while we wait on stdout
+    stderr_tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    
+    def drain_stderr():
+        for line in proc.stderr:
+            stderr_tail.append(line.decode(errors="replace").rstrip())
+    
+    stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+    stderr_thread.start()
+    
+    with proc:
+        # Read each frame directly into its slot of the preallocated buffer
+        while frame_count < max_frames:
+            view = memoryview(frames[frame_count]).cast("B")
+            filled = 0
+            while filled < frame_size:
+                n = proc.stdout.readinto(view[filled:])
+                if not n:
+                    break
+                filled += n
+            if filled < frame_size:
+                break
+            frame_count += 1
+        
+        proc.stdout.close()
+        returncode = proc.wait()
+        stderr_thread.join()
+    
+    if returncode != 0:
+        stderr = "\n".join(stderr_tail)
+        raise RuntimeError(f"ffmpeg failed: {stderr}")
+    
+    if frame_count == 0:
+        raise RuntimeError("No frames decoded from video")
+    
+    print(f"Decoded {frame_count} frames ({width}x{height}) from {video_path}")
+    return frames[:frame_count]
+
+
+def _alloc_frame_buffer(shape: tuple, pin_memory: bool):
+    """Allocate a uint8 frame buffer, in pinned memory when requested and possible."""
+    import numpy as np
+    
+    if pin_memory:
+        try:
+            import torch
+        except ImportError:
+            torch = None
+        if torch is not None and torch.cuda.is_available():
+            # The numpy view keeps the pinned tensor alive
+            return torch.empty(shape, dtype=torch.uint8, pin_memory=True).numpy()
+    
+    return np.empty(shape, dtype=np.uint8)
+
+
+def count_png_frames(directory: str) -> int:
+    """Count the PNG frames in a directory without building a list of paths."""
+    with os.scandir(directory) as it:
+        return sum(1 for entry in it if entry.name.endswith(".png"))
+
+
+def validate_frame_count(input_dir: str, frame_count: Optional[int] = None) -> int:
     """
     Validate that the input directory has the correct number of frames.
     
     Args:
         input_dir: Directory containing PNG frames
+        frame_count: Number of frames already known, e.g. as returned by
+                     extract_frames_from_video. Skips the directory scan.
     
     Returns:
         Number of frames found
@@ -95,10 +373,15 @@ def validate_frame_count(input_dir: str) -> int:
     Raises:
         ValueError: If frame count is outside ActionMesh requirements (16-31)
     """
-    input_path = Path(input_dir)
-    frame_files = sorted(input_path.glob("*.png"))
-    frame_count = len(frame_files)
+    if frame_count is None:
+        frame_count = count_png_frames(input_dir)
     
+    _check_frame_count(frame_count)
+    return frame_count
+
+
+def _check_frame_count(frame_count: int) -> None:
+    """Raise if frame_count is outside ActionMesh requirements (16-31)."""
     if frame_count < 16:
         raise ValueError(
             f"Too few frames: {frame_count}. ActionMesh requires at least 16 frames."
@@ -106,8 +389,6 @@ def validate_frame_count(input_dir: str) -> int:
     
     if frame_count > 31:
         print(f"Warning: {frame_count} frames found. ActionMesh will only use first 31.")
-    
-    return frame_count
 
 
 def run_actionmesh(
@@ -116,12 +397,17 @@ def run_actionmesh(
     fast: bool = True,
     low_ram: bool = True,
     blender_path: Optional[str] = None,
+    on_progress: Optional[Callable[[str], None]] = None,
+    frame_count: Optional[int] = None,
+    frames=None,
 ) -> dict:
     """
     Run ActionMesh to generate animated meshes from input frames.
     
-    This function wraps the official ActionMesh inference script and provides
-    a clean Python API for video-to-mesh conversion.
+    This function wraps ActionMesh and provides a clean Python API for
+    video-to-mesh conversion. When ActionMesh is importable it runs in-process
+    (passing decoded frames in memory if supported); otherwise it falls back
+    to the official inference script in a subprocess.
     
     Args:
         input_dir: Path to directory containing PNG frames (000.png, 001.png, ...)
@@ -136,6 +422,14 @@ def run_actionmesh(
         blender_path: Optional path to Blender 3.5.1 executable for exporting
                       a single animated_mesh.glb file. If None, only per-frame
                       meshes are generated.
+        on_progress: Optional callback receiving each line of frame extraction
+                     and inference-script output as it is produced
+        frame_count: Number of PNG frames in input_dir if already known, e.g.
+                     as returned by extract_frames_from_video. Skips the
+                     directory scan during validation.
+        frames: Optional frames of the input video already decoded with
+                decode_video_frames. Used when SUPPORTS_FRAME_INPUT is true,
+                so the video isn't decoded again; ignored otherwise.
     
     Returns:
         dict with paths to generated outputs:
@@ -180,25 +474,35 @@ def run_actionmesh(
     if not input_path.exists():
         raise ValueError(f"Input directory does not exist: {input_dir}")
     
-    # Check if input is a video file
-    if input_path.is_file() and input_path.suffix.lower() in ['.mp4', '.mov', '.avi', '.webm']:
-        # Extract frames to a temp directory
-        frames_dir = output_path / "extracted_frames"
-        extract_frames_from_video(str(input_path), str(frames_dir))
-        input_dir = str(frames_dir)
-        input_path = Path(input_dir)
+    is_video = input_path.is_file() and input_path.suffix.lower() in VIDEO_EXTENSIONS
+    
+    if SUPPORTS_FRAME_INPUT and (frames is not None or is_video):
+        # Hand the frames to ActionMesh in memory, decoding them if needed
+        if frames is None:
+            frames = decode_video_frames(str(input_path))
+        _check_frame_count(frames.shape[0])
+        return _run_actionmesh_direct(
+            input_dir, output_dir, fast, low_ram, blender_path, frames=frames
+        )
+    
+    # Otherwise ActionMesh reads PNG frames; extract them if given a video
+    input_dir, extracted_count = _extract_if_video(input_dir, output_path, on_progress)
+    input_path = Path(input_dir)
+    validate_frame_count(input_dir, extracted_count or frame_count)
     
-    # Validate frame count
-    validate_frame_count(input_dir)
+    if _HAS_DIRECT:
+        return _run_actionmesh_direct(input_dir, output_dir, fast, low_ram, blender_path)
     
     # Build command for ActionMesh inference script
     inference_script = ACTIONMESH_REPO / "inference" / "video_to_animated_mesh.py"
     
     if not inference_script.exists():
-        # Try alternative: maybe ActionMesh is installed as a package
-        # Fall back to calling via python -m or direct import
-        return _run_actionmesh_direct(
-            input_dir, output_dir, fast, low_ram, blender_path
+        # ActionMesh is neither importable nor cloned - provide helpful error
+        raise RuntimeError(
+            "ActionMesh not found. Please either:\n"
+            "1. Clone the repo: git clone https://github.com/facebookresearch/actionmesh.git actionmesh_repo\n"
+            "2. Install ActionMesh: pip install -e actionmesh_repo/\n"
+            "See the worker README for setup instructions."
         )
     
     cmd = [
@@ -219,58 +523,174 @@ def run_actionmesh(
     
     print(f"Running ActionMesh: {' '.join(cmd)}")
     
-    try:
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=True,
-            env={**os.environ, "PYTHONPATH": str(ACTIONMESH_REPO)},
-        )
-        print(result.stdout)
-    except subprocess.CalledProcessError as e:
-        print(f"ActionMesh stderr: {e.stderr}")
-        print(f"ActionMesh stdout: {e.stdout}")
-        raise RuntimeError(f"ActionMesh inference failed: {e.stderr}")
+    def on_line(line: str) -> bool:
+        print(line)
+        if on_progress and line:
+            on_progress(line)
+        return False
+    
+    returncode, output = _run_streaming(
+        cmd,
+        env=_ACTIONMESH_ENV,
+        on_line=on_line,
+    )
+    
+    if returncode != 0:
+        raise RuntimeError(f"ActionMesh inference failed: {output}")
     
     return _collect_outputs(output_path)
 
 
+def _extract_if_video(
+    input_dir: str,
+    output_path: Path,
+    on_progress: Optional[Callable[[str], None]] = None,
+) -> tuple[str, Optional[int]]:
+    """
+    Extract PNG frames if input_dir is a video file.
+    
+    Returns:
+        (frames directory, frame count), or (input_dir, None) unchanged if it
+        is already a directory of frames
+    """
+    input_path = Path(input_dir)
+    if not (input_path.is_file() and input_path.suffix.lower() in VIDEO_EXTENSIONS):
+        return input_dir, None
+    
+    frames_dir = output_path / "extracted_frames"
+    frame_count = extract_frames_from_video(
+        str(input_path), str(frames_dir), on_progress=on_progress
+    )
+    return str(frames_dir), frame_count
+
+
+def run_actionmesh_batch(
+    requests: list[dict],
+    on_result: Optional[Callable[[int, object], None]] = None,
+) -> list:
+    """
+    Run ActionMesh on several jobs at once.
+    
+    Args:
+        requests: List of keyword-argument dicts for run_actionmesh, each with
+                  input_dir, output_dir, fast, low_ram and blender_path, and
+                  optionally frame_count and frames. Callers should pass
+                  extracted frame directories (or decoded frames) so that
+                  no ffmpeg work happens on the inference thread.
+        on_result: Optional callback receiving (index, result) as soon as
+                   each request's result is known, from this thread
+    
+    Returns:
+        One entry per request, in order: the outputs dict (see run_actionmesh)
+        on success, or the exception raised for that request.
+    
+    If the installed ActionMesh provides run_inference_batch, requests sharing
+    the same settings go through the model in a single call. Otherwise, and
+    for requests carrying in-memory frames, they run one after another in
+    this thread, reusing the already-loaded model.
+    """
+    results: list = [None] * len(requests)
+    
+    def finish(i, result):
+        results[i] = result
+        if on_result:
+            on_result(i, result)
+    
+    # Prepare each job individually; only valid ones join a batch
+    groups: dict[tuple, list[tuple[int, str]]] = {}
+    for i, request in enumerate(requests):
+        try:
+            if not _HAS_BATCH or request.get("frames") is not None:
+                finish(i, run_actionmesh(**request))
+                continue
+            
+            output_path = Path(request["output_dir"])
+            output_path.mkdir(parents=True, exist_ok=True)
+            frames_dir, frame_count = _extract_if_video(request["input_dir"], output_path)
+            validate_frame_count(frames_dir, frame_count or request.get("frame_count"))
+        except Exception as e:
+            finish(i, e)
+            continue
+        key = (request["fast"], request["low_ram"], request.get("blender_path"))
+        groups.setdefault(key, []).append((i, frames_dir))
+    
+    for (fast, low_ram, blender_path), members in groups.items():
+        indices = [i for i, _ in members]
+        try:
+            with _autocast():
+                _actionmesh_inference.run_inference_batch(
+                    input_paths=[frames_dir for _, frames_dir in members],
+                    output_paths=[requests[i]["output_dir"] for i in indices],
+                    fast=fast,
+                    low_ram=low_ram,
+                    blender_path=blender_path,
+                )
+        except Exception as e:
+            for i in indices:
+                finish(i, e)
+            continue
+        
+        for i in indices:
+            finish(i, _collect_outputs(Path(requests[i]["output_dir"])))
+    
+    return results
+
+
 def _run_actionmesh_direct(
     input_dir: str,
     output_dir: str,
     fast: bool,
     low_ram: bool,
     blender_path: Optional[str],
+    frames=None,
 ) -> dict:
     """
-    Run ActionMesh directly via Python imports when script is not available.
+    Run ActionMesh directly via Python imports, without spawning a subprocess.
     
-    This is a fallback method that imports ActionMesh modules directly.
-    Useful when ActionMesh is installed as a package.
+    If ``frames`` (a uint8 array of shape (N, H, W, 3)) is given and the
+    installed ActionMesh supports tensor input, the frames are passed in
+    memory. Otherwise ActionMesh reads the PNG frames from ``input_dir``.
     """
+    # Every in-process entry point runs under the same (opt-in) autocast
+    with _autocast():
+        if frames is not None and _HAS_TENSOR_INPUT:
+            _actionmesh_inference.run_inference_tensor(
+                frames=frames,
+                output_path=output_dir,
+                fast=fast,
+                low_ram=low_ram,
+                blender_path=blender_path,
+            )
+        else:
+            _actionmesh_inference.run_inference(
+                input_path=input_dir,
+                output_path=output_dir,
+                fast=fast,
+                low_ram=low_ram,
+                blender_path=blender_path,
+            )
+    
+    return _collect_outputs(Path(output_dir))
+
+
+def _autocast():
+    """Inference-mode BF16/FP16 autocast on CUDA when AUTOCAST is set, else a no-op."""
+    if not AUTOCAST:
+        return contextlib.nullcontext()
+    
     try:
-        # Try importing ActionMesh modules
-        from actionmesh.inference import run_inference
-        
-        run_inference(
-            input_path=input_dir,
-            output_path=output_dir,
-            fast=fast,
-            low_ram=low_ram,
-            blender_path=blender_path,
-        )
-        
+        import torch
     except ImportError:
-        # ActionMesh not installed - provide helpful error
-        raise RuntimeError(
-            "ActionMesh not found. Please either:\n"
-            "1. Clone the repo: git clone https://github.com/facebookresearch/actionmesh.git actionmesh_repo\n"
-            "2. Install ActionMesh: pip install -e actionmesh_repo/\n"
-            "See the worker README for setup instructions."
-        )
+        return contextlib.nullcontext()
     
-    return _collect_outputs(Path(output_dir))
+    if not torch.cuda.is_available():
+        return contextlib.nullcontext()
+    
+    dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    stack = contextlib.ExitStack()
+    stack.enter_context(torch.inference_mode())
+    stack.enter_context(torch.autocast("cuda", dtype=dtype))
+    return stack
 
 
 def _collect_outputs(output_path: Path) -> dict:
@@ -281,22 +701,21 @@ def _collect_outputs(output_path: Path) -> dict:
         "preview_video": None,
     }
     
-    # Find per-frame meshes
-    for mesh_file in sorted(output_path.glob("mesh_*.glb")):
-        outputs["per_frame_meshes"].append(str(mesh_file))
-    
-    # Check for animated mesh
-    animated_mesh = output_path / "animated_mesh.glb"
-    if animated_mesh.exists():
-        outputs["animated_mesh"] = str(animated_mesh)
-    
-    # Check for preview video (ActionMesh may output various names)
-    for pattern in ["*.mp4", "render*.mp4", "preview*.mp4"]:
-        for video_file in output_path.glob(pattern):
-            outputs["preview_video"] = str(video_file)
-            break
-        if outputs["preview_video"]:
-            break
+    # Classify everything in a single directory scan
+    mesh_files = []
+    with os.scandir(output_path) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith("mesh_") and name.endswith(".glb"):
+                mesh_files.append(entry.path)
+            elif name == "animated_mesh.glb":
+                outputs["animated_mesh"] = entry.path
+            elif name.endswith(".mp4") and outputs["preview_video"] is None:
+                # ActionMesh may output various names for the preview video
+                outputs["preview_video"] = entry.path
+    
+    mesh_files.sort()
+    outputs["per_frame_meshes"] = mesh_files
     
     return outputs
 
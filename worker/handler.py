@@ -3,39 +3,133 @@ RunPod Serverless Handler for ActionMesh
 
 Uses RunPod's PyTorch template and installs ActionMesh on first cold start.
 Models are cached in /runpod-volume for faster subsequent runs.
+
+If ACTIONMESH_PATH points outside /runpod-volume (an image with ActionMesh
+already installed), the install step is skipped and the same handler is used.
+This is the only module that calls runpod.serverless.start.
 """
 
 import os
 import sys
 import base64
+import binascii
+import mmap
 import tempfile
 import shutil
 import subprocess
 import json
+import time
+import contextlib
+import asyncio
+from collections import deque
+from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import runpod
 
 # Paths
-ACTIONMESH_PATH = "/runpod-volume/actionmesh"
-CACHE_PATH = "/runpod-volume/cache"
+ACTIONMESH_PATH = os.getenv("ACTIONMESH_PATH", "/runpod-volume/actionmesh")
+CACHE_PATH = os.getenv("HF_HOME", "/runpod-volume/cache")
 INSTALL_FLAG = "/runpod-volume/.actionmesh_installed"
+MODELS_FLAG = "/runpod-volume/.actionmesh_models_preloaded"
+
+# Make in-process HuggingFace lookups use the same cache as the inference script
+os.environ.setdefault("HF_HOME", CACHE_PATH)
+
+# Install into the network volume on cold start, or use a prebuilt image as-is
+USE_VOLUME_INSTALL = ACTIONMESH_PATH.startswith("/runpod-volume")
+# Explicit hub cache override only; None uses huggingface_hub's default
+# ($HF_HOME/hub), which is where diffusers and transformers look too
+HF_CACHE_PATH = os.getenv("HUGGINGFACE_HUB_CACHE")
+
+# Whether ACTIONMESH_PATH has been added to sys.path (checked once)
+_ACTIONMESH_ON_PATH = ACTIONMESH_PATH in sys.path
+
+# Environment for the inference script, snapshotted once after install
+_ACTIONMESH_ENV: Optional[dict] = None
+
+# Per-job scratch space goes on tmpfs when there is enough room
+SHM_PATH = "/dev/shm"
+SHM_WORK_ROOT = os.path.join(SHM_PATH, "actionmesh")
+SHM_MIN_FREE = 2 * 1024 * 1024 * 1024  # 2GB
+
+# Largest video accepted from video_url (the work dir may be on tmpfs, i.e. RAM)
+MAX_VIDEO_SIZE = int(os.getenv("MAX_VIDEO_SIZE", 100 * 1024 * 1024))  # 100MB default
+
+# Optional S3-compatible storage for outputs. When S3_BUCKET is unset,
+# outputs are returned inline as base64 data URLs instead.
+S3_BUCKET = os.getenv("S3_BUCKET")
+S3_ENDPOINT_URL = os.getenv("S3_ENDPOINT_URL")  # e.g. Cloudflare R2, MinIO
+S3_URL_EXPIRES = int(os.getenv("S3_URL_EXPIRES", 7 * 24 * 3600))
+
+# HuggingFace model loaded once per worker for in-process inference
+ACTIONMESH_MODEL_ID = os.getenv("ACTIONMESH_MODEL_ID", "facebook/ActionMesh")
+
+# All weights ActionMesh needs, downloaded at install time instead of on the first job
+PRELOAD_MODELS = (
+    ACTIONMESH_MODEL_ID,
+    "VAST-AI/TripoSG",
+    "facebook/dinov2-large",
+    "briaai/RMBG-1.4",
+)
+WARMUP_FRAMES = 16
+WARMUP_RESOLUTION = 512
+
+# Opt-in: frame count and resolution vary per job, and the fixed-shape warmup
+# can't cover them all, so compilation can still add latency to early jobs
+TORCH_COMPILE = os.getenv("ACTIONMESH_COMPILE", "0") == "1"
+
+# Opt-in: run actionmesh.inference.run_inference under inference mode with
+# BF16/FP16 autocast. That call covers the whole pipeline, including mesh
+# extraction and export, so it is off unless known to be safe
+AUTOCAST = os.getenv("ACTIONMESH_AUTOCAST", "0") == "1"
+
+# Micro-batching: concurrent jobs with the same frame shape and mode share one
+# forward pass. Disabled (1) by default; requires a pipeline that accepts a
+# leading batch dimension (probed at startup). Batching is turned off if the
+# probe fails or the in-process pipeline is unavailable.
+MAX_BATCH = int(os.getenv("ACTIONMESH_MAX_BATCH", 1))
+BATCH_TIMEOUT = float(os.getenv("ACTIONMESH_BATCH_TIMEOUT_MS", 20)) / 1000
+BATCH_ITEM_BYTES = int(float(os.getenv("ACTIONMESH_BATCH_ITEM_GB", 6)) * 1024**3)
+
+# Subprocess output: lines kept for error messages, and progress update rate
+OUTPUT_TAIL_LINES = 200
+PROGRESS_INTERVAL = 1.0  # seconds
+
+# Base64 input is decoded in chunks of this many characters (multiple of 4)
+B64_CHUNK_CHARS = 4 * 1024 * 1024
 
 
 def install_actionmesh():
     """Install ActionMesh on first cold start."""
-    if os.path.exists(INSTALL_FLAG):
+    global _ACTIONMESH_ON_PATH
+    
+    if not USE_VOLUME_INSTALL or os.path.exists(INSTALL_FLAG):
         print("ActionMesh already installed, skipping...")
         # Just add to path
-        if ACTIONMESH_PATH not in sys.path:
+        if not _ACTIONMESH_ON_PATH:
             sys.path.insert(0, ACTIONMESH_PATH)
+            _ACTIONMESH_ON_PATH = True
+        ensure_models_preloaded()
+        _snapshot_env()
         return True
     
     print("Installing ActionMesh (first cold start)...")
     
-    # Install ffmpeg
-    subprocess.run(["apt-get", "update"], capture_output=True)
-    subprocess.run(["apt-get", "install", "-y", "ffmpeg", "git", "git-lfs"], capture_output=True)
+    # Install system tools, skipping apt entirely if the image already has them
+    missing = [tool for tool in ("ffmpeg", "git", "git-lfs") if shutil.which(tool) is None]
+    if missing:
+        print(f"Installing system packages: {' '.join(missing)}")
+        apt_env = {**os.environ, "DEBIAN_FRONTEND": "noninteractive"}
+        subprocess.run(
+            ["apt-get", "-o", "Acquire::Retries=3", "update"],
+            capture_output=True, env=apt_env,
+        )
+        subprocess.run(
+            ["apt-get", "-o", "Acquire::Retries=3", "install", "-y", *missing],
+            capture_output=True, env=apt_env,
+        )
     
     # Clone ActionMesh
     os.makedirs(ACTIONMESH_PATH, exist_ok=True)
@@ -67,7 +161,14 @@ def install_actionmesh():
     ], check=True)
     
     # Add to path
-    sys.path.insert(0, ACTIONMESH_PATH)
+    if not _ACTIONMESH_ON_PATH:
+        sys.path.insert(0, ACTIONMESH_PATH)
+        _ACTIONMESH_ON_PATH = True
+    
+    # Download model weights now so the first job doesn't pay for it
+    ensure_models_preloaded()
+    
+    _snapshot_env()
     
     # Create flag file
     Path(INSTALL_FLAG).touch()
@@ -76,27 +177,209 @@ def install_actionmesh():
     return True
 
 
-def extract_frames(video_path: str, output_dir: str, max_frames: int = 31) -> int:
+def _snapshot_env():
+    """Build the inference script's environment once instead of copying os.environ per job."""
+    global _ACTIONMESH_ENV
+    _ACTIONMESH_ENV = {
+        **os.environ,
+        "PYTHONPATH": ACTIONMESH_PATH,
+        "HF_HOME": CACHE_PATH,
+    }
+
+
+def ensure_models_preloaded():
+    """
+    Preload model weights once per network volume.
+    
+    Tracked separately from INSTALL_FLAG so volumes installed before
+    preloading existed still get their weights downloaded.
+    """
+    if not USE_VOLUME_INSTALL or os.path.exists(MODELS_FLAG):
+        return
+    preload_models()
+    Path(MODELS_FLAG).touch()
+
+
+def preload_models():
+    """Download all required HuggingFace weights into the persistent cache."""
+    try:
+        subprocess.run([
+            sys.executable, "-m", "pip", "install", "-q", "hf_transfer"
+        ], check=True)
+        os.environ["HF_HUB_ENABLE_HF_TRANSFER"] = "1"
+    except subprocess.CalledProcessError:
+        print("hf_transfer unavailable, using default downloader")
+    
+    from huggingface_hub import snapshot_download
+    
+    for repo_id in PRELOAD_MODELS:
+        print(f"Downloading {repo_id}...")
+        snapshot_download(repo_id, cache_dir=HF_CACHE_PATH)
+
+
+def run_streaming(cmd: list, env: Optional[dict] = None, on_line=None) -> tuple[int, str]:
+    """
+    Run a command, streaming its combined stdout/stderr line by line.
+    
+    Lines for which on_line returns True are treated as progress and are not
+    kept. Returns the exit code and the last OUTPUT_TAIL_LINES other lines.
+    """
+    tail = deque(maxlen=OUTPUT_TAIL_LINES)
+    with subprocess.Popen(
+        cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        env=env,
+    ) as proc:
+        for line in proc.stdout:
+            line = line.rstrip()
+            if on_line and on_line(line):
+                continue
+            tail.append(line)
+    
+    return proc.returncode, "\n".join(tail)
+
+
+def extract_frames(video_path: str, output_dir: str, max_frames: int = 31, on_progress=None) -> int:
     """Extract frames from video using ffmpeg."""
     output_pattern = os.path.join(output_dir, "%03d.png")
     
     cmd = [
-        "ffmpeg", "-y", "-i", video_path,
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-nostats", "-progress", "pipe:1",
+        "-i", video_path,
         "-frames:v", str(max_frames),
         "-start_number", "0",
         output_pattern
     ]
     
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    if result.returncode != 0:
-        raise RuntimeError(f"ffmpeg failed: {result.stderr}")
+    def on_line(line):
+        # -progress emits key=value lines; errors are free text
+        key, sep, value = line.partition("=")
+        if on_progress and key == "frame":
+            on_progress(f"Extracted {value} frames")
+        return bool(sep) and " " not in key
+    
+    returncode, output = run_streaming(cmd, on_line=on_line)
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {output}")
+    
+    with os.scandir(output_dir) as it:
+        return sum(1 for entry in it if entry.name.endswith(".png"))
+
+
+async def decode_frames(
+    video_path: str,
+    video_base64: Optional[str] = None,
+    max_frames: int = 31,
+):
+    """
+    Decode frames into a (N, H, W, 3) uint8 array with a single ffmpeg process.
+    
+    If video_base64 is given it is decoded chunk by chunk and piped into
+    ffmpeg's stdin, so base64 decoding overlaps with video decoding and the
+    video never touches disk. Otherwise ffmpeg reads video_path.
+    
+    Frames come back as PPM images, whose headers carry the (rotated)
+    frame size, so no separate ffprobe pass is needed.
+    """
+    import numpy as np
+    
+    cmd = [
+        "ffmpeg", "-loglevel", "error",
+        "-i", "pipe:0" if video_base64 else video_path,
+        "-frames:v", str(max_frames),
+        "-f", "image2pipe", "-c:v", "ppm",
+        "pipe:1",
+    ]
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdin=asyncio.subprocess.PIPE if video_base64 else asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    
+    async def feed_stdin():
+        leftover = ""
+        try:
+            for i in range(0, len(video_base64), B64_CHUNK_CHARS):
+                # Drop line breaks (MIME-style input) and decode whole 4-character
+                # groups, carrying the remainder over to the next chunk
+                data = leftover + "".join(video_base64[i:i + B64_CHUNK_CHARS].split())
+                cut = len(data) - len(data) % 4
+                leftover = data[cut:]
+                proc.stdin.write(base64.b64decode(data[:cut]))
+                await proc.stdin.drain()
+            if leftover:
+                base64.b64decode(leftover)  # Raises binascii.Error: incomplete group
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # ffmpeg stops reading once it has max_frames
+        except binascii.Error as e:
+            return e  # Raised once ffmpeg has exited
+        finally:
+            proc.stdin.close()
+    
+    async def read_frames():
+        frames = None
+        frame_count = 0
+        while frame_count < max_frames:
+            try:
+                await proc.stdout.readuntil(b"\n")  # "P6"
+            except asyncio.IncompleteReadError:
+                break
+            width, height = map(int, (await proc.stdout.readuntil(b"\n")).split())
+            await proc.stdout.readuntil(b"\n")  # max value, always 255
+            
+            if frames is None:
+                frames = np.empty((max_frames, height, width, 3), dtype=np.uint8)
+            data = await proc.stdout.readexactly(width * height * 3)
+            frames[frame_count] = np.frombuffer(data, dtype=np.uint8).reshape(height, width, 3)
+            frame_count += 1
+        
+        if frames is None:
+            return np.empty((0, 0, 0, 3), dtype=np.uint8)
+        return frames[:frame_count]
+    
+    tasks = [read_frames(), proc.stderr.read()]
+    if video_base64:
+        tasks.append(feed_stdin())
+    frames, stderr, *feed_error = await asyncio.gather(*tasks)
+    
+    returncode = await proc.wait()
+    if feed_error and feed_error[0]:
+        raise feed_error[0]
+    if returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace')}")
     
-    frame_count = len(list(Path(output_dir).glob("*.png")))
-    return frame_count
+    return frames
 
 
-def run_actionmesh(input_dir: str, output_dir: str, fast: bool = True, low_ram: bool = True):
-    """Run ActionMesh inference."""
+def run_actionmesh(
+    input_dir: str,
+    output_dir: str,
+    fast: bool = True,
+    low_ram: bool = True,
+    on_progress=None,
+):
+    """
+    Run ActionMesh inference on a directory of PNG frames.
+    
+    Calls actionmesh.inference.run_inference in-process when it could be
+    imported at startup, which avoids paying interpreter and torch start-up
+    on every job. Otherwise runs the inference script in a subprocess.
+    """
+    if RUN_INFERENCE is not None:
+        with _autocast():
+            RUN_INFERENCE(
+                input_path=input_dir,
+                output_path=output_dir,
+                fast=fast,
+                low_ram=low_ram,
+            )
+        return
+    
     inference_script = os.path.join(ACTIONMESH_PATH, "inference", "video_to_animated_mesh.py")
     
     cmd = [
@@ -110,27 +393,272 @@ def run_actionmesh(input_dir: str, output_dir: str, fast: bool = True, low_ram:
     if low_ram:
         cmd.append("--low_ram")
     
-    env = os.environ.copy()
-    env["PYTHONPATH"] = ACTIONMESH_PATH
-    env["HF_HOME"] = CACHE_PATH
-    env["TRANSFORMERS_CACHE"] = CACHE_PATH
+    def on_line(line):
+        print(line)
+        if on_progress and line:
+            on_progress(line)
     
     print(f"Running: {' '.join(cmd)}")
-    result = subprocess.run(cmd, capture_output=True, text=True, env=env)
+    returncode, output = run_streaming(cmd, env=_ACTIONMESH_ENV, on_line=on_line)
     
-    print(f"STDOUT: {result.stdout}")
-    if result.returncode != 0:
-        print(f"STDERR: {result.stderr}")
-        raise RuntimeError(f"ActionMesh failed: {result.stderr}")
+    if returncode != 0:
+        raise RuntimeError(f"ActionMesh failed: {output}")
+
+
+def _autocast():
+    """Inference-mode BF16/FP16 autocast on CUDA when AUTOCAST is set, else a no-op."""
+    if not AUTOCAST:
+        return contextlib.nullcontext()
+    
+    import torch
+    
+    if not torch.cuda.is_available():
+        return contextlib.nullcontext()
+    
+    dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    stack = contextlib.ExitStack()
+    stack.enter_context(torch.inference_mode())
+    stack.enter_context(torch.autocast("cuda", dtype=dtype))
+    return stack
+
+
+def make_progress_reporter(job: dict):
+    """Return a callback that forwards progress messages to RunPod, at most once a second."""
+    last_sent = 0.0
+    
+    def report(message: str):
+        nonlocal last_sent
+        now = time.monotonic()
+        if now - last_sent >= PROGRESS_INTERVAL:
+            last_sent = now
+            runpod.serverless.progress_update(job, message)
+    
+    return report
+
+
+def load_run_inference():
+    """Import ActionMesh's in-process inference entry point, or None if unavailable."""
+    try:
+        from actionmesh.inference import run_inference
+    except ImportError as e:
+        print(f"actionmesh.inference.run_inference unavailable ({e}), using inference script")
+        return None
     
-    return result.stdout
+    return run_inference
+
+
+def load_pipeline():
+    """
+    Load the ActionMesh pipeline onto the GPU and warm it up.
+    
+    Runs a dummy forward pass so weight loading, CUDA context creation and
+    cuDNN autotuning happen at cold start rather than on the first job.
+    Returns None if the pipeline API is unavailable, in which case the
+    handler falls back to the inference script. If batching is enabled but
+    the pipeline rejects a batched input, batching is turned off.
+    """
+    global MAX_BATCH
+    
+    try:
+        import torch
+        from actionmesh.inference import ActionMeshPipeline
+    except ImportError as e:
+        print(f"In-process ActionMesh unavailable ({e}), using inference script")
+        return None
+    
+    if not torch.cuda.is_available():
+        print("CUDA not available, using inference script")
+        return None
+    
+    # BF16 where supported (Ampere+), FP16 otherwise (e.g. T4)
+    dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+    
+    print(f"Loading ActionMesh pipeline: {ACTIONMESH_MODEL_ID} ({dtype})")
+    pipe = ActionMeshPipeline.from_pretrained(
+        ACTIONMESH_MODEL_ID,
+        cache_dir=HF_CACHE_PATH,
+        device="cuda",
+        torch_dtype=dtype,
+    )
+    pipe.inference_dtype = dtype
+    
+    if TORCH_COMPILE:
+        # Compile the generator network; the warmup pass below triggers compilation.
+        # dynamic=True so new frame counts/resolutions reuse the compiled graph
+        # instead of recompiling (and capturing new CUDA graphs) on the request path
+        for name in ("transformer", "model", "unet"):
+            module = getattr(pipe, name, None)
+            if isinstance(module, torch.nn.Module):
+                setattr(pipe, name, torch.compile(module, dynamic=True, fullgraph=False))
+                break
+    
+    print("Warming up ActionMesh pipeline...")
+    dummy = torch.zeros(
+        WARMUP_FRAMES, 3, WARMUP_RESOLUTION, WARMUP_RESOLUTION,
+        device="cuda", dtype=dtype,
+    )
+    with torch.inference_mode(), torch.autocast("cuda", dtype=dtype):
+        pipe(dummy)
+    
+    if MAX_BATCH > 1:
+        # Probe the batch dimension once here rather than failing batched jobs
+        try:
+            with torch.inference_mode(), torch.autocast("cuda", dtype=dtype):
+                pipe(torch.stack([dummy, dummy]))
+        except Exception as e:
+            print(f"Warning: pipeline does not accept batched input ({e}), disabling batching")
+            MAX_BATCH = 1
+    torch.cuda.synchronize()
+    torch.cuda.empty_cache()
+    
+    print("ActionMesh pipeline ready")
+    return pipe
+
+
+def _frames_to_tensor(frames, dtype):
+    """Upload (N, H, W, 3) uint8 frames as a (N, 3, H, W) tensor in [0, 1]."""
+    import torch
+    
+    # Single H2D copy + cast, then NHWC -> NCHW
+    frames_t = torch.from_numpy(frames).to("cuda", dtype, non_blocking=True)
+    return frames_t.permute(0, 3, 1, 2).div_(255.0)
+
+
+def run_pipeline(frames, output_dir: str, fast: bool = True, low_ram: bool = True):
+    """Run the warm in-process pipeline on a (N, H, W, 3) uint8 frame array."""
+    import torch
+    
+    dtype = PIPE.inference_dtype
+    frames_t = _frames_to_tensor(frames, dtype)
+    
+    with torch.inference_mode(), torch.autocast("cuda", dtype=dtype):
+        PIPE(frames_t, output_path=output_dir, fast=fast, low_ram=low_ram)
+
+
+def batch_chunk_size(count: int) -> int:
+    """How many videos fit in the currently free VRAM, assuming BATCH_ITEM_BYTES each."""
+    import torch
+    
+    free_bytes, _ = torch.cuda.mem_get_info()
+    return max(1, min(count, free_bytes // BATCH_ITEM_BYTES))
+
+
+def run_pipeline_batch(frames_list: list, output_dirs: list, fast: bool, low_ram: bool):
+    """Run several same-shape frame arrays through the pipeline as one batch."""
+    import torch
+    
+    if len(frames_list) == 1:
+        run_pipeline(frames_list[0], output_dirs[0], fast=fast, low_ram=low_ram)
+        return
+    
+    dtype = PIPE.inference_dtype
+    batch_t = torch.stack([_frames_to_tensor(f, dtype) for f in frames_list])
+    with torch.inference_mode(), torch.autocast("cuda", dtype=dtype):
+        PIPE(batch_t, output_path=output_dirs, fast=fast, low_ram=low_ram)
+
+
+_batch_queue: Optional[asyncio.Queue] = None
+_batch_task: Optional[asyncio.Task] = None
+
+
+async def infer(frames, output_dir: str, fast: bool, low_ram: bool):
+    """Run the pipeline, via the micro-batcher when batching is enabled."""
+    global _batch_queue, _batch_task
+    
+    if MAX_BATCH <= 1:
+        await asyncio.to_thread(run_pipeline, frames, output_dir, fast=fast, low_ram=low_ram)
+        return
+    
+    if _batch_queue is None:
+        # Created lazily so it binds to runpod's event loop
+        _batch_queue = asyncio.Queue()
+        # Keep a reference so the worker task isn't garbage-collected
+        _batch_task = asyncio.create_task(batch_worker(_batch_queue))
+    
+    future = asyncio.get_running_loop().create_future()
+    await _batch_queue.put((frames, output_dir, fast, low_ram, future))
+    await future
+
+
+async def batch_worker(queue: asyncio.Queue):
+    """Collect queued requests for up to BATCH_TIMEOUT and run them as batches."""
+    loop = asyncio.get_running_loop()
+    
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + BATCH_TIMEOUT
+        while len(batch) < MAX_BATCH:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        try:
+            # Only requests with identical frame shapes and modes can be stacked
+            groups = {}
+            for request in batch:
+                frames, _, fast, low_ram, _ = request
+                groups.setdefault((frames.shape, fast, low_ram), []).append(request)
+            
+            # Split each group to fit in free VRAM; a failed chunk only fails its own jobs
+            for (_, fast, low_ram), requests in groups.items():
+                chunk = batch_chunk_size(len(requests))
+                for i in range(0, len(requests), chunk):
+                    chunk_requests = requests[i:i + chunk]
+                    try:
+                        await asyncio.to_thread(
+                            run_pipeline_batch,
+                            [r[0] for r in chunk_requests],
+                            [r[1] for r in chunk_requests],
+                            fast,
+                            low_ram,
+                        )
+                    except Exception as e:
+                        for r in chunk_requests:
+                            if not r[4].done():
+                                r[4].set_exception(e)
+                    else:
+                        for r in chunk_requests:
+                            if not r[4].done():
+                                r[4].set_result(None)
+        except Exception as e:
+            # e.g. mem_get_info after a sticky CUDA error; fail the batch
+            # rather than killing this task and leaving callers waiting
+            for r in batch:
+                if not r[4].done():
+                    r[4].set_exception(e)
+
+
+def find_output_files(output_dir: str):
+    """
+    Find ActionMesh outputs with a single directory scan.
+    
+    Returns:
+        (sorted per-frame mesh paths, animated mesh path or None, preview video path or None)
+    """
+    mesh_files = []
+    animated_mesh = None
+    preview_video = None
+    
+    with os.scandir(output_dir) as it:
+        for entry in it:
+            name = entry.name
+            if name.startswith("mesh_") and name.endswith(".glb"):
+                mesh_files.append(entry.path)
+            elif name == "animated_mesh.glb":
+                animated_mesh = entry.path
+            elif name.endswith(".mp4") and preview_video is None:
+                preview_video = entry.path
+    
+    mesh_files.sort()
+    return mesh_files, animated_mesh, preview_video
 
 
 def file_to_base64_url(file_path: str) -> str:
     """Convert file to base64 data URL."""
-    with open(file_path, "rb") as f:
-        data = base64.b64encode(f.read()).decode("utf-8")
-    
     ext = Path(file_path).suffix.lower()
     mime_types = {
         ".glb": "model/gltf-binary",
@@ -139,15 +667,129 @@ def file_to_base64_url(file_path: str) -> str:
     }
     mime_type = mime_types.get(ext, "application/octet-stream")
     
-    return f"data:{mime_type};base64,{data}"
+    # Encode straight from the page cache via mmap instead of reading the
+    # whole file into a bytes object first
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            encoded = b""
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                encoded = base64.b64encode(mm)
+    
+    return f"data:{mime_type};base64," + encoded.decode("ascii")
+
+
+def make_work_dir() -> str:
+    """Create a per-job work directory, on tmpfs if it has enough free space."""
+    work_root = None
+    if os.path.isdir(SHM_PATH) and shutil.disk_usage(SHM_PATH).free >= SHM_MIN_FREE:
+        os.makedirs(SHM_WORK_ROOT, exist_ok=True)
+        work_root = SHM_WORK_ROOT
+    
+    return tempfile.mkdtemp(prefix="actionmesh_", dir=work_root)
+
+
+def save_base64_video(video_base64: str, dest_path: str) -> int:
+    """Decode a base64 video to disk."""
+    video_data = base64.b64decode(video_base64)
+    with open(dest_path, "wb") as f:
+        f.write(video_data)
+    
+    return len(video_data)
+
+
+def download_video(url: str, dest_path: str) -> int:
+    """Stream a video from a (presigned) URL to disk, aborting once it exceeds MAX_VIDEO_SIZE."""
+    import requests
+    
+    too_large = f"Video too large. Maximum size is {MAX_VIDEO_SIZE // (1024*1024)}MB"
+    total = 0
+    with requests.get(url, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        # Give up before reading the body if the server says it's too large
+        content_length = response.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > MAX_VIDEO_SIZE:
+            raise ValueError(too_large)
+        with open(dest_path, "wb") as f:
+            for chunk in response.iter_content(64 * 1024):
+                total += len(chunk)
+                if total > MAX_VIDEO_SIZE:
+                    raise ValueError(too_large)
+                f.write(chunk)
+    
+    return total
+
+
+def make_s3_uploader():
+    """
+    Return an upload(path, key) function that uploads to S3_BUCKET and
+    returns a presigned URL.
+    
+    One client is created per call, from its own session (creating clients
+    from boto3's shared default session isn't thread-safe), and shared by all
+    uploads: clients themselves are thread-safe. Files are uploaded in
+    parallel by the caller, so each transfer runs on the calling thread.
+    """
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    
+    client = boto3.session.Session().client("s3", endpoint_url=S3_ENDPOINT_URL)
+    config = TransferConfig(multipart_threshold=8 * 1024 * 1024, use_threads=False)
+    
+    def upload(path: str, key: str) -> str:
+        client.upload_file(path, S3_BUCKET, key, Config=config)
+        return client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": S3_BUCKET, "Key": key},
+            ExpiresIn=S3_URL_EXPIRES,
+        )
+    
+    return upload
 
 
-def handler(job):
+def publish_outputs(job_id: str, output_dir: str) -> dict:
+    """Upload or base64-encode ActionMesh outputs and return their URLs."""
+    outputs = {
+        "per_frame_meshes": [],
+        "animated_mesh": None,
+        "preview_video": None,
+    }
+    
+    mesh_files, animated_mesh, preview_video = find_output_files(output_dir)
+    print(f"Found {len(mesh_files)} mesh files")
+    
+    if S3_BUCKET:
+        # Upload everything to S3 and return presigned URLs
+        key_prefix = f"actionmesh/{job_id}"
+        upload = make_s3_uploader()
+        
+        def publish(path):
+            return upload(path, f"{key_prefix}/{Path(path).name}")
+    else:
+        # Fall back to inline base64 (limit meshes to save bandwidth)
+        mesh_files = mesh_files[:5]  # First 5 meshes as preview
+        publish = file_to_base64_url
+    
+    # Uploads and base64 encoding are independent per file, so run them concurrently
+    with ThreadPoolExecutor(max_workers=min(16, len(mesh_files) + 2)) as executor:
+        animated_future = executor.submit(publish, animated_mesh) if animated_mesh else None
+        preview_future = executor.submit(publish, preview_video) if preview_video else None
+        outputs["per_frame_meshes"] = list(executor.map(publish, mesh_files))
+        if animated_future:
+            outputs["animated_mesh"] = animated_future.result()
+        if preview_future:
+            outputs["preview_video"] = preview_future.result()
+    
+    return outputs
+
+
+async def handler(job):
     """
     RunPod Serverless handler.
     
     Input:
         {
+            "video_url": str,         # URL to download the video from, or
             "video_base64": str,      # Base64-encoded video
             "filename": str,          # Original filename  
             "mode": str,              # "default", "fast", or "fast_low_ram"
@@ -156,87 +798,92 @@ def handler(job):
     
     Output:
         {
-            "per_frame_meshes": [base64_url, ...],
-            "animated_mesh": base64_url or null,
-            "preview_video": base64_url or null
+            "per_frame_meshes": [url, ...],
+            "animated_mesh": url or null,
+            "preview_video": url or null
         }
+    
+    URLs are presigned S3 URLs when S3_BUCKET is set, otherwise base64 data
+    URLs (limited to the first 5 per-frame meshes to save bandwidth).
     """
     try:
-        # Install ActionMesh if needed
-        install_actionmesh()
+        if not _INSTALLED:
+            return {"error": "ActionMesh is not installed"}
         
         job_input = job["input"]
         
         # Get input parameters
+        video_url = job_input.get("video_url")
         video_base64 = job_input.get("video_base64")
-        filename = job_input.get("filename", "video.mp4")
+        filename = os.path.basename(job_input.get("filename", "video.mp4"))
         mode = job_input.get("mode", "fast_low_ram")
         
-        if not video_base64:
-            return {"error": "No video_base64 provided"}
+        if not video_url and not video_base64:
+            return {"error": "No video_url or video_base64 provided"}
         
         # Determine processing flags
         fast = mode in ["fast", "fast_low_ram"]
         low_ram = mode == "fast_low_ram"
         
         print(f"Processing video: {filename}, mode: {mode}")
+        report_progress = make_progress_reporter(job)
         
         # Create temp directories
-        work_dir = tempfile.mkdtemp(prefix="actionmesh_")
+        work_dir = make_work_dir()
         input_dir = os.path.join(work_dir, "input")
         output_dir = os.path.join(work_dir, "output")
         os.makedirs(input_dir)
         os.makedirs(output_dir)
         
         try:
-            # Save video from base64
             video_path = os.path.join(work_dir, filename)
-            video_data = base64.b64decode(video_base64)
-            with open(video_path, "wb") as f:
-                f.write(video_data)
+            if video_url:
+                video_size = await asyncio.to_thread(download_video, video_url, video_path)
+                print(f"Downloaded video: {video_size} bytes")
             
-            print(f"Saved video: {len(video_data)} bytes")
-            
-            # Extract frames
-            frame_count = extract_frames(video_path, input_dir)
+            # Extract frames (in memory for the warm pipeline, PNGs for the script)
+            if PIPE is not None:
+                try:
+                    # Base64 input is streamed straight into ffmpeg
+                    frames = await decode_frames(video_path, None if video_url else video_base64)
+                except (RuntimeError, binascii.Error):
+                    if video_url:
+                        raise
+                    # Not streamable (e.g. MP4 with the moov atom at the end) or
+                    # not strictly chunkable base64, decode from disk
+                    await asyncio.to_thread(save_base64_video, video_base64, video_path)
+                    frames = await decode_frames(video_path)
+                frame_count = len(frames)
+            else:
+                if not video_url:
+                    await asyncio.to_thread(save_base64_video, video_base64, video_path)
+                frame_count = await asyncio.to_thread(
+                    extract_frames, video_path, input_dir, on_progress=report_progress
+                )
             print(f"Extracted {frame_count} frames")
             
             if frame_count < 16:
                 return {"error": f"Video too short: {frame_count} frames. Need at least 16."}
             
             # Run ActionMesh
-            run_actionmesh(input_dir, output_dir, fast=fast, low_ram=low_ram)
+            if PIPE is not None:
+                await infer(frames, output_dir, fast=fast, low_ram=low_ram)
+            else:
+                await asyncio.to_thread(
+                    run_actionmesh, input_dir, output_dir,
+                    fast=fast, low_ram=low_ram, on_progress=report_progress,
+                )
             
             # Collect outputs
-            outputs = {
-                "per_frame_meshes": [],
-                "animated_mesh": None,
-                "preview_video": None,
-            }
-            
-            # Process per-frame meshes (limit to save bandwidth)
-            mesh_files = sorted(Path(output_dir).glob("mesh_*.glb"))
-            print(f"Found {len(mesh_files)} mesh files")
-            
-            for mesh_file in mesh_files[:5]:  # First 5 meshes as preview
-                outputs["per_frame_meshes"].append(file_to_base64_url(str(mesh_file)))
-            
-            # Check for animated mesh
-            animated_mesh = Path(output_dir) / "animated_mesh.glb"
-            if animated_mesh.exists():
-                outputs["animated_mesh"] = file_to_base64_url(str(animated_mesh))
-            
-            # Check for preview video
-            for video_file in Path(output_dir).glob("*.mp4"):
-                outputs["preview_video"] = file_to_base64_url(str(video_file))
-                break
+            job_id = job.get("id", os.path.basename(work_dir))
+            outputs = await asyncio.to_thread(publish_outputs, job_id, output_dir)
             
             print("Processing complete!")
             return outputs
             
         finally:
             # Cleanup
-            shutil.rmtree(work_dir, ignore_errors=True)
+            await asyncio.to_thread(shutil.rmtree, work_dir, ignore_errors=True)
             
     except Exception as e:
         import traceback
@@ -245,5 +892,32 @@ def handler(job):
         return {"error": str(e)}
 
 
-# Start the serverless handler
-runpod.serverless.start({"handler": handler})
+# Install and warm up the model once per worker, before accepting jobs.
+# A failed install is reported per job instead of crash-looping the worker.
+try:
+    _INSTALLED = install_actionmesh()
+except Exception as e:
+    print(f"ActionMesh install failed: {e}")
+    _INSTALLED = False
+
+RUN_INFERENCE = load_run_inference() if _INSTALLED else None
+
+# A pipeline that fails to load or warm up falls back to RUN_INFERENCE or the script
+PIPE = None
+if _INSTALLED:
+    try:
+        PIPE = load_pipeline()
+    except Exception as e:
+        print(f"ActionMesh pipeline failed to load ({e}), using fallback inference")
+
+if PIPE is None:
+    # Batching needs the in-process pipeline; the fallback paths must not run
+    # several jobs on the GPU at once
+    MAX_BATCH = 1
+
+# Start the serverless handler (runpod runs coroutine handlers on its event loop).
+# With batching enabled, allow enough concurrent jobs per worker to fill a batch.
+runpod.serverless.start({
+    "handler": handler,
+    "concurrency_modifier": lambda current_concurrency: max(1, MAX_BATCH),
+})
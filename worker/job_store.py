@@ -10,11 +10,23 @@ TODO: For production with multiple workers, replace with:
 - Celery or similar for job queue management
 """
 
+import os
+import json
+import time
+import queue
+import bisect
+import asyncio
 import threading
-from datetime import datetime
+from pathlib import Path
+from itertools import islice
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional, Dict
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields, asdict
+
+
+# Number of independently locked shards; must be a power of two
+NUM_SHARDS = 16
 
 
 class JobStatus(str, Enum):
@@ -25,15 +37,28 @@ class JobStatus(str, Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Job:
     """Represents an ActionMesh processing job."""
     job_id: str
     status: JobStatus = JobStatus.QUEUED
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at_ns: int = field(default_factory=time.time_ns)
+    updated_at_ns: int = field(default_factory=time.time_ns)
     error: Optional[str] = None
     outputs: Optional[dict] = None
+    mesh_files: list[str] = field(default_factory=list)
+    mesh_crcs: dict[str, str] = field(default_factory=dict)
+    archive_path: Optional[str] = None
+    
+    @property
+    def created_at(self) -> datetime:
+        """Creation time as a UTC datetime."""
+        return datetime.fromtimestamp(self.created_at_ns / 1e9, tz=timezone.utc)
+    
+    @property
+    def updated_at(self) -> datetime:
+        """Last update time as a UTC datetime."""
+        return datetime.fromtimestamp(self.updated_at_ns / 1e9, tz=timezone.utc)
 
 
 class JobStore:
@@ -43,6 +68,13 @@ class JobStore:
     This provides a simple way to track jobs for single-instance deployments.
     For production multi-instance deployments, consider using Redis or a database.
     
+    After open_log, every change is also appended to a file as a JSON line
+    by a background thread, so callers never wait on disk I/O.
+    
+    Updates never touch disk themselves. Instead the IDs of changed jobs are
+    tracked, and save_snapshot (called periodically by the owner) rewrites
+    a JSON snapshot only when something changed; load_snapshot restores it.
+    
     Example:
         store = JobStore()
         job = store.create("job-123")
@@ -52,8 +84,34 @@ class JobStore:
     """
     
     def __init__(self):
-        self._jobs: Dict[str, Job] = {}
-        self._lock = threading.Lock()
+        # Jobs are spread over shards, each with its own lock, so that
+        # operations on different jobs don't contend on a single lock
+        self._shards: list[tuple[Dict[str, Job], threading.Lock]] = [
+            ({}, threading.Lock()) for _ in range(NUM_SHARDS)
+        ]
+        
+        # All jobs ordered by creation time (oldest first), so listing the
+        # newest jobs never needs a full sort
+        self._by_time: list[Job] = []
+        self._index_lock = threading.Lock()
+        
+        # Long-poll waiters per job, woken whenever the job's status changes.
+        # Each waiter remembers its event loop so updates from worker threads
+        # can wake it safely.
+        self._waiters: Dict[str, list[tuple[asyncio.AbstractEventLoop, asyncio.Event]]] = {}
+        self._waiters_lock = threading.Lock()
+        
+        # IDs of jobs changed since the last snapshot
+        self._dirty: set[str] = set()
+        self._dirty_lock = threading.Lock()
+        
+        # Change records for the JSONL log (see open_log); None stops the writer
+        self._log_queue: Optional[queue.SimpleQueue] = None
+        self._log_thread: Optional[threading.Thread] = None
+    
+    def _shard(self, job_id: str) -> tuple[Dict[str, Job], threading.Lock]:
+        """Return the (jobs, lock) shard responsible for a job ID."""
+        return self._shards[hash(job_id) & (NUM_SHARDS - 1)]
     
     def create(self, job_id: str) -> Job:
         """
@@ -68,13 +126,20 @@ class JobStore:
         Raises:
             ValueError: If a job with this ID already exists
         """
-        with self._lock:
-            if job_id in self._jobs:
+        jobs, lock = self._shard(job_id)
+        with lock:
+            if job_id in jobs:
                 raise ValueError(f"Job {job_id} already exists")
             
             job = Job(job_id=job_id)
-            self._jobs[job_id] = job
-            return job
+            jobs[job_id] = job
+        
+        with self._index_lock:
+            bisect.insort(self._by_time, job, key=_created_at_ns)
+        
+        self._mark_dirty(job_id)
+        self._log(job_id, "create", status=job.status)
+        return job
     
     def get(self, job_id: str) -> Optional[Job]:
         """
@@ -86,8 +151,9 @@ class JobStore:
         Returns:
             The Job object, or None if not found
         """
-        with self._lock:
-            return self._jobs.get(job_id)
+        # A single dict lookup is atomic, so reads don't need the shard lock
+        jobs, _ = self._shard(job_id)
+        return jobs.get(job_id)
     
     def update(
         self,
@@ -95,6 +161,9 @@ class JobStore:
         status: Optional[JobStatus] = None,
         error: Optional[str] = None,
         outputs: Optional[dict] = None,
+        mesh_files: Optional[list[str]] = None,
+        mesh_crcs: Optional[dict[str, str]] = None,
+        archive_path: Optional[str] = None,
     ) -> Optional[Job]:
         """
         Update a job's status and/or outputs.
@@ -104,24 +173,40 @@ class JobStore:
             status: New status (optional)
             error: Error message if job failed (optional)
             outputs: Output file paths when job completes (optional)
+            mesh_files: Sorted paths of the per-frame meshes (optional)
+            mesh_crcs: CRC-32 (hex) of each per-frame mesh by filename (optional)
+            archive_path: Path of the prebuilt meshes.zip (optional)
             
         Returns:
             The updated Job object, or None if not found
         """
-        with self._lock:
-            job = self._jobs.get(job_id)
+        jobs, lock = self._shard(job_id)
+        with lock:
+            job = jobs.get(job_id)
             if not job:
                 return None
             
-            if status is not None:
-                job.status = status
-            if error is not None:
-                job.error = error
-            if outputs is not None:
-                job.outputs = outputs
+            status_changed = status is not None and status != job.status
+            changes = {
+                name: value for name, value in (
+                    ("status", status),
+                    ("error", error),
+                    ("outputs", outputs),
+                    ("mesh_files", mesh_files),
+                    ("mesh_crcs", mesh_crcs),
+                    ("archive_path", archive_path),
+                ) if value is not None
+            }
+            for name, value in changes.items():
+                setattr(job, name, value)
             
-            job.updated_at = datetime.utcnow()
-            return job
+            job.updated_at_ns = time.time_ns()
+        
+        self._mark_dirty(job_id)
+        self._log(job_id, "update", **changes)
+        if status_changed:
+            self._notify(job_id)
+        return job
     
     def delete(self, job_id: str) -> bool:
         """
@@ -133,11 +218,70 @@ class JobStore:
         Returns:
             True if the job was deleted, False if not found
         """
-        with self._lock:
-            if job_id in self._jobs:
-                del self._jobs[job_id]
-                return True
+        jobs, lock = self._shard(job_id)
+        with lock:
+            job = jobs.pop(job_id, None)
+        
+        if job is None:
             return False
+        
+        with self._index_lock:
+            self._unindex(job)
+        self._mark_dirty(job_id)
+        self._log(job_id, "delete")
+        self._notify(job_id)
+        return True
+    
+    async def wait_for_change(self, job_id: str, timeout: float) -> Optional[Job]:
+        """
+        Wait until a job's status changes, or until timeout expires.
+        
+        Args:
+            job_id: The job identifier
+            timeout: Maximum number of seconds to wait
+            
+        Returns:
+            The Job object as of when the wait ended, or None if not found
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        
+        # Register before reading the status so a concurrent update can't
+        # slip in between the read and the wait unnoticed
+        with self._waiters_lock:
+            self._waiters.setdefault(job_id, []).append(waiter)
+        try:
+            job = self.get(job_id)
+            if job is None or job.status in (JobStatus.FINISHED, JobStatus.ERROR):
+                return job
+            try:
+                await asyncio.wait_for(waiter[1].wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        finally:
+            with self._waiters_lock:
+                waiters = self._waiters.get(job_id)
+                if waiters and waiter in waiters:
+                    waiters.remove(waiter)
+                    if not waiters:
+                        del self._waiters[job_id]
+        
+        return self.get(job_id)
+    
+    def _notify(self, job_id: str) -> None:
+        """Wake every long-poll waiter for a job."""
+        with self._waiters_lock:
+            waiters = self._waiters.pop(job_id, ())
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+    
+    def _unindex(self, job: Job) -> None:
+        """Remove a job from the time index. Caller must hold _index_lock."""
+        i = bisect.bisect_left(self._by_time, job.created_at_ns, key=_created_at_ns)
+        while i < len(self._by_time):
+            if self._by_time[i] is job:
+                del self._by_time[i]
+                return
+            i += 1
     
     def list_jobs(
         self,
@@ -154,16 +298,11 @@ class JobStore:
         Returns:
             List of Job objects, sorted by creation time (newest first)
         """
-        with self._lock:
-            jobs = list(self._jobs.values())
-            
+        with self._index_lock:
+            newest_first = reversed(self._by_time)
             if status:
-                jobs = [j for j in jobs if j.status == status]
-            
-            # Sort by creation time, newest first
-            jobs.sort(key=lambda j: j.created_at, reverse=True)
-            
-            return jobs[:limit]
+                newest_first = (j for j in newest_first if j.status == status)
+            return list(islice(newest_first, limit))
     
     def cleanup_old_jobs(self, max_age_hours: int = 24) -> int:
         """
@@ -175,20 +314,159 @@ class JobStore:
         Returns:
             Number of jobs removed
         """
-        from datetime import timedelta
-        
-        cutoff = datetime.utcnow() - timedelta(hours=max_age_hours)
+        cutoff_ns = time.time_ns() - max_age_hours * 3600 * 10**9
         removed = 0
         
-        with self._lock:
-            job_ids_to_remove = [
-                job_id
-                for job_id, job in self._jobs.items()
-                if job.created_at < cutoff
-            ]
-            
-            for job_id in job_ids_to_remove:
-                del self._jobs[job_id]
-                removed += 1
+        # Old jobs form a prefix of the time index
+        with self._index_lock:
+            i = bisect.bisect_left(self._by_time, cutoff_ns, key=_created_at_ns)
+            expired = self._by_time[:i]
+            del self._by_time[:i]
+        
+        for job in expired:
+            jobs, lock = self._shard(job.job_id)
+            with lock:
+                if jobs.get(job.job_id) is not job:
+                    continue
+                del jobs[job.job_id]
+            removed += 1
+            self._mark_dirty(job.job_id)
+            self._log(job.job_id, "delete")
+            self._notify(job.job_id)
         
         return removed
+    
+    def save_snapshot(self, path: str) -> bool:
+        """
+        Write all jobs to a JSON snapshot if any changed since the last one.
+        
+        The file is written to a temporary name, fsynced and renamed into
+        place, so a crash mid-write leaves the previous snapshot intact.
+        
+        Args:
+            path: Snapshot file path
+            
+        Returns:
+            True if a snapshot was written, False if nothing had changed
+        """
+        with self._dirty_lock:
+            if not self._dirty:
+                return False
+            dirty, self._dirty = self._dirty, set()
+        
+        with self._index_lock:
+            jobs = list(self._by_time)
+        
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump([asdict(job) for job in jobs], f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            # Keep the changes pending so the next snapshot retries
+            with self._dirty_lock:
+                self._dirty |= dirty
+            raise
+        return True
+    
+    def load_snapshot(self, path: str) -> int:
+        """
+        Restore jobs from a snapshot written by save_snapshot.
+        
+        Jobs that were still queued or running when the snapshot was taken
+        can't be resumed, so they are restored as failed.
+        
+        Args:
+            path: Snapshot file path
+            
+        Returns:
+            Number of jobs restored (0 if there is no snapshot or it is unreadable)
+        """
+        try:
+            with open(path, encoding="utf-8") as f:
+                records = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except ValueError as e:
+            # A corrupt snapshot shouldn't keep the API from starting
+            print(f"Ignoring unreadable job snapshot {path}: {e}")
+            return 0
+        
+        names = {f.name for f in fields(Job)}
+        for record in records:
+            job = Job(**{k: v for k, v in record.items() if k in names})
+            job.status = JobStatus(job.status)
+            if job.status in (JobStatus.QUEUED, JobStatus.RUNNING):
+                job.status = JobStatus.ERROR
+                job.error = "Worker restarted before the job finished"
+            
+            jobs, lock = self._shard(job.job_id)
+            with lock:
+                jobs[job.job_id] = job
+            with self._index_lock:
+                bisect.insort(self._by_time, job, key=_created_at_ns)
+        
+        return len(records)
+    
+    def _mark_dirty(self, job_id: str) -> None:
+        """Record that a job changed since the last snapshot."""
+        with self._dirty_lock:
+            self._dirty.add(job_id)
+    
+    def open_log(self, log_path: str) -> None:
+        """
+        Start appending a JSON line for every job change to log_path.
+        
+        Records are written by a background thread; call close() to flush
+        them and stop it.
+        """
+        if self._log_thread is not None:
+            raise RuntimeError("Job log is already open")
+        
+        self._log_queue = queue.SimpleQueue()
+        self._log_thread = threading.Thread(
+            target=self._write_log,
+            args=(log_path, self._log_queue),
+            name="job-log-writer",
+            daemon=True,
+        )
+        self._log_thread.start()
+    
+    def close(self) -> None:
+        """Flush pending log records and stop the log writer thread."""
+        if self._log_thread is not None:
+            log_queue, self._log_queue = self._log_queue, None
+            log_queue.put(None)
+            self._log_thread.join()
+            self._log_thread = None
+    
+    def _log(self, job_id: str, event: str, **fields) -> None:
+        """Queue a change record for the JSONL log, if enabled."""
+        log_queue = self._log_queue
+        if log_queue is not None:
+            log_queue.put({"ts_ns": time.time_ns(), "job_id": job_id, "event": event, **fields})
+    
+    @staticmethod
+    def _write_log(log_path: str, log_queue: queue.SimpleQueue) -> None:
+        """Log writer thread: append queued records, flushing once per burst."""
+        Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+        with open(log_path, "a", encoding="utf-8") as f:
+            while True:
+                record = log_queue.get()
+                while record is not None:
+                    f.write(json.dumps(record) + "\n")
+                    try:
+                        record = log_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                f.flush()
+                if record is None:
+                    return
+
+
+def _created_at_ns(job: Job) -> int:
+    """Sort key for the JobStore time index."""
+    return job.created_at_ns
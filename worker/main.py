@@ -6,31 +6,163 @@ as an HTTP API suitable for deployment on GPU services.
 """
 
 import os
+
+# Cap intra-op CPU threads before torch/numpy are imported. GPU inference
+# dominates, and one thread per core on a CPU-limited container just thrashes.
+for _var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
 import uuid
 import shutil
 import asyncio
+import zipfile
+import tempfile
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from enum import Enum
 
-from fastapi import FastAPI, HTTPException, UploadFile, File, Form, BackgroundTasks
+import aiofiles
+import httpx
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse
 from pydantic import BaseModel, HttpUrl
 
 from job_store import JobStore, JobStatus, Job
-from actionmesh_wrapper import run_actionmesh, extract_frames_from_video, validate_frame_count
+from actionmesh_wrapper import (
+    SUPPORTS_FRAME_INPUT,
+    SUPPORTS_BATCH,
+    run_actionmesh_batch,
+    count_video_frames,
+    decode_video_frames,
+    extract_frames_from_video,
+)
 
 
 # Configuration from environment
 JOBS_DIR = Path(os.getenv("JOBS_DIR", "/tmp/actionmesh_jobs"))
 BLENDER_PATH = os.getenv("BLENDER_PATH")  # Optional: path to Blender executable
 MAX_UPLOAD_SIZE = int(os.getenv("MAX_UPLOAD_SIZE", 100 * 1024 * 1024))  # 100MB default
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Uploads/downloads are streamed to disk in 1MB chunks
+
+# Outputs never change once a job has finished, and job IDs are never reused
+IMMUTABLE_CACHE_HEADERS = {"Cache-Control": "public, max-age=31536000, immutable"}
+
+# Upper bound on the long-poll wait for GET /jobs/{job_id}?wait=N
+MAX_POLL_WAIT = float(os.getenv("MAX_POLL_WAIT", 60))
+
+# Optional append-only JSONL audit log of job changes (disabled by default;
+# it is never read back and grows without bound, so rotate it externally)
+JOB_LOG_PATH = os.getenv("JOB_LOG_PATH")
+
+# Job state is snapshotted here every SNAPSHOT_INTERVAL seconds (when changed)
+# and restored at startup; set JOB_SNAPSHOT_PATH="" to disable
+JOB_SNAPSHOT_PATH = os.getenv("JOB_SNAPSHOT_PATH", str(JOBS_DIR / "jobs.json"))
+SNAPSHOT_INTERVAL = float(os.getenv("SNAPSHOT_INTERVAL", 5))
 
 # Global job store
 job_store = JobStore()
 
+# Bound concurrent ffmpeg/ffprobe runs so bursts of uploads can't
+# spawn an unbounded number of processes
+MAX_CONCURRENT_EXTRACTIONS = int(os.getenv("MAX_CONCURRENT_EXTRACTIONS", os.cpu_count() or 4))
+extraction_slots = asyncio.Semaphore(MAX_CONCURRENT_EXTRACTIONS)
+
+# ActionMesh uses at most this many frames, so longer videos are only read this far
+MAX_FRAMES = 31
+
+# Jobs waiting for the GPU are collected into batches of up to MAX_BATCH_SIZE
+# (when ActionMesh provides run_inference_batch; otherwise one at a time),
+# waiting at most BATCH_TIMEOUT_MS for the batch to fill
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", 4))
+BATCH_TIMEOUT = float(os.getenv("BATCH_TIMEOUT_MS", 100)) / 1000
+
+# Number of jobs processed concurrently. GPU work is still serialized through
+# the inference coroutine; this only needs to be large enough to fill a batch.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", MAX_BATCH_SIZE))
+
+
+@dataclass
+class InferenceRequest:
+    """A job waiting for the inference coroutine; future resolves to its outputs."""
+    future: asyncio.Future
+    input_dir: str  # Directory of extracted PNG frames, or the video itself with frames
+    output_dir: str
+    fast: bool
+    low_ram: bool
+    blender_path: Optional[str]
+    frame_count: Optional[int] = None  # Number of PNG frames in input_dir, if known
+    frames: Any = None  # Pre-decoded frames, see decode_video_frames
+
+
+def settle_future(future: asyncio.Future, result):
+    """Resolve an inference future with a result or exception, unless already done."""
+    if future.done():
+        return
+    if isinstance(result, Exception):
+        future.set_exception(result)
+    else:
+        future.set_result(result)
+
+
+async def inference_coroutine(queue: asyncio.Queue):
+    """Collect queued inference requests into batches and run them on the GPU."""
+    loop = asyncio.get_running_loop()
+    # Without a batched ActionMesh entry point a batch would just run its jobs
+    # in sequence, holding early results back, so take one request at a time
+    max_batch = MAX_BATCH_SIZE if SUPPORTS_BATCH else 1
+    while True:
+        batch = [await queue.get()]
+        deadline = loop.time() + BATCH_TIMEOUT
+        while len(batch) < max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        # Settle each future as soon as its own result is ready
+        def on_result(i, result, batch=batch):
+            loop.call_soon_threadsafe(settle_future, batch[i].future, result)
+        
+        try:
+            await asyncio.to_thread(run_actionmesh_batch, [
+                {
+                    "input_dir": request.input_dir,
+                    "output_dir": request.output_dir,
+                    "fast": request.fast,
+                    "low_ram": request.low_ram,
+                    "blender_path": request.blender_path,
+                    "frame_count": request.frame_count,
+                    "frames": request.frames,
+                }
+                for request in batch
+            ], on_result)
+        except Exception as e:
+            for request in batch:
+                settle_future(request.future, e)
+
+
+async def snapshot_coroutine():
+    """Periodically write the job store snapshot, off the event loop."""
+    while True:
+        await asyncio.sleep(SNAPSHOT_INTERVAL)
+        try:
+            await asyncio.to_thread(job_store.save_snapshot, JOB_SNAPSHOT_PATH)
+        except OSError as e:
+            print(f"Failed to write job snapshot: {e}")
+
+
+async def cleanup_coroutine(queue: asyncio.Queue):
+    """Delete job directories one at a time so bursts of deletes don't pile up disk I/O."""
+    while True:
+        job_dir = await queue.get()
+        await asyncio.to_thread(shutil.rmtree, job_dir, ignore_errors=True)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -39,7 +171,44 @@ async def lifespan(app: FastAPI):
     JOBS_DIR.mkdir(parents=True, exist_ok=True)
     print(f"ActionMesh Worker started. Jobs directory: {JOBS_DIR}")
     print(f"Blender path: {BLENDER_PATH or 'Not configured (animated_mesh.glb export disabled)'}")
+    if JOB_LOG_PATH:
+        job_store.open_log(JOB_LOG_PATH)
+    if JOB_SNAPSHOT_PATH:
+        restored = job_store.load_snapshot(JOB_SNAPSHOT_PATH)
+        print(f"Restored {restored} jobs from {JOB_SNAPSHOT_PATH}")
+        snapshot_task = asyncio.create_task(snapshot_coroutine())
+    # Check for a GPU once; health probes just report the cached result
+    try:
+        import torch
+        app.state.gpu_available = torch.cuda.is_available()
+    except ImportError:
+        app.state.gpu_available = False
+    app.state.inference_queue = asyncio.Queue()
+    inference_task = asyncio.create_task(inference_coroutine(app.state.inference_queue))
+    app.state.job_queue = asyncio.Queue()
+    job_tasks = [
+        asyncio.create_task(job_worker(app.state.job_queue))
+        for _ in range(JOB_WORKERS)
+    ]
+    app.state.cleanup_queue = asyncio.Queue()
+    cleanup_task = asyncio.create_task(cleanup_coroutine(app.state.cleanup_queue))
+    # One shared client so URL downloads reuse pooled (HTTP/2) connections
+    app.state.http = httpx.AsyncClient(
+        http2=True,
+        timeout=60.0,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=64),
+    )
     yield
+    for task in job_tasks:
+        task.cancel()
+    inference_task.cancel()
+    cleanup_task.cancel()
+    await app.state.http.aclose()
+    if JOB_SNAPSHOT_PATH:
+        snapshot_task.cancel()
+        job_store.save_snapshot(JOB_SNAPSHOT_PATH)
+    job_store.close()
     # Shutdown: cleanup could go here
     print("ActionMesh Worker shutting down")
 
@@ -51,6 +220,36 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Slack for multipart boundaries and form fields around the uploaded file
+MULTIPART_OVERHEAD = 64 * 1024
+
+
+class UploadSizeLimitMiddleware:
+    """
+    Reject job uploads whose Content-Length is already too large.
+    
+    FastAPI parses multipart forms before the endpoint runs, so this has to
+    happen in middleware to avoid receiving the body at all. It is plain ASGI
+    and only inspects POST /jobs; every other request passes straight through.
+    """
+    
+    def __init__(self, app, max_size: int):
+        self.app = app
+        self.max_size = max_size
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["method"] == "POST" and scope["path"] == "/jobs":
+            for name, value in scope["headers"]:
+                if name == b"content-length" and value.isdigit() and int(value) > self.max_size:
+                    response = JSONResponse(status_code=413, content={"detail": file_too_large().detail})
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
+
+
+# Added before CORS so it runs inside it and early 413s still carry CORS headers
+app.add_middleware(UploadSizeLimitMiddleware, max_size=MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD)
+
 # Configure CORS for frontend access
 # TODO: In production, restrict origins to your frontend domain
 app.add_middleware(
@@ -87,30 +286,131 @@ class HealthResponse(BaseModel):
     """Health check response."""
     status: str
     gpu_available: bool
+    queue_depth: int
+
+
+# Processing mode -> (fast, low_ram) flags for ActionMesh
+MODE_FLAGS: dict[ProcessingMode, tuple[bool, bool]] = {
+    # High quality mode - requires 32GB+ GPU
+    ProcessingMode.DEFAULT: (False, False),
+    # Fast mode - requires 16GB+ GPU
+    ProcessingMode.FAST: (True, False),
+    # Fast + Low RAM - works on 12GB GPUs (default for wider compatibility)
+    ProcessingMode.FAST_LOW_RAM: (True, True),
+}
+
+# Output file extension -> media type; anything else is application/octet-stream
+MEDIA_TYPES = {
+    ".glb": "model/gltf-binary",
+    ".mp4": "video/mp4",
+    ".zip": "application/zip",
+}
+
+
+def file_too_large() -> HTTPException:
+    """Error raised as soon as an upload or download exceeds MAX_UPLOAD_SIZE."""
+    return HTTPException(
+        status_code=413,
+        detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE // (1024*1024)}MB"
+    )
+
+
+async def save_upload(file: UploadFile, video_path: Path) -> int:
+    """Stream an uploaded file to disk, aborting once it exceeds MAX_UPLOAD_SIZE."""
+    total = 0
+    async with aiofiles.open(video_path, "wb") as f:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            total += len(chunk)
+            if total > MAX_UPLOAD_SIZE:
+                raise file_too_large()
+            await f.write(chunk)
+    return total
+
+
+async def download_video(video_url: str, video_path: Path) -> int:
+    """Stream a video from a URL to disk, aborting once it exceeds MAX_UPLOAD_SIZE."""
+    total = 0
+    async with app.state.http.stream("GET", video_url) as response:
+        response.raise_for_status()
+        # Give up before reading the body if the server says it's too large
+        content_length = response.headers.get("content-length", "")
+        if content_length.isdigit() and int(content_length) > MAX_UPLOAD_SIZE:
+            raise file_too_large()
+        async with aiofiles.open(video_path, "wb") as f:
+            async for chunk in response.aiter_bytes(UPLOAD_CHUNK_SIZE):
+                total += len(chunk)
+                if total > MAX_UPLOAD_SIZE:
+                    raise file_too_large()
+                await f.write(chunk)
+    return total
+
+
+async def count_frames(video_path: Path) -> int:
+    """Count a video's frames in a worker thread so it doesn't block the event loop."""
+    async with extraction_slots:
+        return await asyncio.to_thread(
+            count_video_frames, str(video_path), max_frames=MAX_FRAMES
+        )
+
+
+def build_meshes_archive(mesh_files: list[str], zip_path: str) -> dict[str, str]:
+    """
+    Write a job's per-frame meshes into a ZIP archive.
+    
+    GLB buffers are already compressed, so entries are stored rather than
+    deflated. The archive is written to a unique temporary file and renamed
+    into place, so concurrent builds never share a partial file and a
+    download never sees one.
+    
+    Returns:
+        The CRC-32 of each mesh as 8 hex digits, keyed by filename. zipfile
+        computes these while writing, so they serve as ETags at no extra cost.
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix=".zip.tmp", dir=os.path.dirname(zip_path))
+    try:
+        with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w", zipfile.ZIP_STORED) as zipf:
+            for mesh_file in mesh_files:
+                zipf.write(mesh_file, os.path.basename(mesh_file))
+            crcs = {info.filename: f"{info.CRC:08x}" for info in zipf.infolist()}
+        os.replace(tmp_path, zip_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return crcs
 
 
-def get_mode_flags(mode: ProcessingMode) -> tuple[bool, bool]:
-    """Convert processing mode to fast/low_ram flags."""
-    if mode == ProcessingMode.DEFAULT:
-        # High quality mode - requires 32GB+ GPU
-        # TODO: Change to (False, False) if you have a 32GB GPU
-        return False, False
-    elif mode == ProcessingMode.FAST:
-        # Fast mode - requires 16GB+ GPU
-        return True, False
-    else:  # FAST_LOW_RAM
-        # Fast + Low RAM - works on 12GB GPUs (default for wider compatibility)
-        return True, True
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match header matches an ETag."""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a cached download."""
+    return Response(status_code=304, headers={"ETag": etag, **IMMUTABLE_CACHE_HEADERS})
+
+
+async def job_worker(queue: asyncio.Queue):
+    """Process queued jobs one at a time."""
+    while True:
+        job_id, mode, blender_export = await queue.get()
+        try:
+            await process_job(job_id, mode, blender_export)
+        finally:
+            queue.task_done()
 
 
 async def process_job(job_id: str, mode: ProcessingMode, blender_export: bool):
-    """Background task to process a job."""
+    """Run a queued job through ActionMesh and record its outputs."""
     job = job_store.get(job_id)
     if not job:
         return
     
     job_dir = JOBS_DIR / job_id
-    input_dir = job_dir / "input"
+    video_path = job_dir / "input_video.mp4"
     output_dir = job_dir / "output"
     output_dir.mkdir(parents=True, exist_ok=True)
     
@@ -118,58 +418,72 @@ async def process_job(job_id: str, mode: ProcessingMode, blender_export: bool):
         # Update status to running
         job_store.update(job_id, status=JobStatus.RUNNING)
         
-        # Validate frame count
-        frame_files = list(input_dir.glob("*.png"))
-        if not frame_files:
-            raise ValueError("No frames found in input directory")
-        
-        frame_count = len(frame_files)
-        if frame_count < 16:
-            raise ValueError(f"Video too short: {frame_count} frames. ActionMesh requires at least 16 frames.")
-        if frame_count > 31:
-            # ActionMesh will ignore extra frames, but log a warning
-            print(f"Warning: {frame_count} frames provided, only first 31 will be used")
+        # Prepare the input here, while other jobs use the GPU, so the
+        # inference thread only runs inference: decode into (pinned) memory
+        # if ActionMesh can take frames directly, else extract PNG frames
+        frames = None
+        frame_count = None
+        if SUPPORTS_FRAME_INPUT:
+            input_dir = video_path
+            async with extraction_slots:
+                frames = await asyncio.to_thread(
+                    decode_video_frames, str(video_path), pin_memory=True
+                )
+        else:
+            input_dir = job_dir / "input"
+            async with extraction_slots:
+                frame_count = await asyncio.to_thread(
+                    extract_frames_from_video, str(video_path), str(input_dir)
+                )
         
         # Get processing flags
-        fast, low_ram = get_mode_flags(mode)
+        fast, low_ram = MODE_FLAGS[mode]
         
         # Determine blender path
         blender_path = BLENDER_PATH if blender_export else None
         
-        # Run ActionMesh
-        await asyncio.to_thread(
-            run_actionmesh,
+        # Run ActionMesh, batched with any other jobs waiting for the GPU
+        request = InferenceRequest(
+            future=asyncio.get_running_loop().create_future(),
             input_dir=str(input_dir),
             output_dir=str(output_dir),
             fast=fast,
             low_ram=low_ram,
             blender_path=blender_path,
+            frame_count=frame_count,
+            frames=frames,
         )
+        await app.state.inference_queue.put(request)
+        results = await request.future
         
-        # Collect output files
+        # Build output URLs from the files ActionMesh reported
+        mesh_files = results["per_frame_meshes"]
         outputs = {
-            "per_frame_meshes": [],
+            "per_frame_meshes": [
+                f"/outputs/{job_id}/{os.path.basename(path)}" for path in mesh_files
+            ],
             "animated_mesh": None,
             "preview_video": None,
         }
-        
-        # Find per-frame meshes
-        for mesh_file in sorted(output_dir.glob("mesh_*.glb")):
-            outputs["per_frame_meshes"].append(f"/outputs/{job_id}/{mesh_file.name}")
-        
-        # Check for animated mesh
-        animated_mesh = output_dir / "animated_mesh.glb"
-        if animated_mesh.exists():
+        if results["animated_mesh"]:
             outputs["animated_mesh"] = f"/outputs/{job_id}/animated_mesh.glb"
+        if results["preview_video"]:
+            outputs["preview_video"] = f"/outputs/{job_id}/{os.path.basename(results['preview_video'])}"
         
-        # Check for preview video
-        for video_ext in ["*.mp4", "*.MP4"]:
-            for video_file in output_dir.glob(video_ext):
-                outputs["preview_video"] = f"/outputs/{job_id}/{video_file.name}"
-                break
+        # Prebuild meshes.zip (empty if there are no meshes) so every
+        # download is a plain file response
+        archive_path = str(job_dir / "meshes.zip")
+        mesh_crcs = await asyncio.to_thread(build_meshes_archive, mesh_files, archive_path)
         
         # Update job as finished
-        job_store.update(job_id, status=JobStatus.FINISHED, outputs=outputs)
+        job_store.update(
+            job_id,
+            status=JobStatus.FINISHED,
+            outputs=outputs,
+            mesh_files=mesh_files,
+            mesh_crcs=mesh_crcs,
+            archive_path=archive_path,
+        )
         
     except Exception as e:
         print(f"Job {job_id} failed: {e}")
@@ -179,22 +493,33 @@ async def process_job(job_id: str, mode: ProcessingMode, blender_export: bool):
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
     """Check if the worker is healthy and GPU is available."""
-    gpu_available = False
-    try:
-        import torch
-        gpu_available = torch.cuda.is_available()
-    except ImportError:
-        pass
-    
     return HealthResponse(
         status="healthy",
-        gpu_available=gpu_available,
+        gpu_available=app.state.gpu_available,
+        queue_depth=app.state.job_queue.qsize(),
+    )
+
+
+@app.get("/health/live")
+async def liveness_check():
+    """Liveness probe: the process is up and serving requests."""
+    return {"status": "alive"}
+
+
+@app.get("/health/ready", response_model=HealthResponse)
+async def readiness_check(response: Response):
+    """Readiness probe: fails with 503 when no GPU is available."""
+    if not app.state.gpu_available:
+        response.status_code = 503
+    return HealthResponse(
+        status="ready" if app.state.gpu_available else "unavailable",
+        gpu_available=app.state.gpu_available,
+        queue_depth=app.state.job_queue.qsize(),
     )
 
 
 @app.post("/jobs", response_model=JobResponse)
 async def create_job(
-    background_tasks: BackgroundTasks,
     file: Optional[UploadFile] = File(None),
     mode: ProcessingMode = Form(ProcessingMode.FAST_LOW_RAM),
     blender_export: bool = Form(False),
@@ -216,8 +541,7 @@ async def create_job(
     # Generate job ID and create directories
     job_id = str(uuid.uuid4())
     job_dir = JOBS_DIR / job_id
-    input_dir = job_dir / "input"
-    input_dir.mkdir(parents=True, exist_ok=True)
+    job_dir.mkdir(parents=True, exist_ok=True)
     
     try:
         if file:
@@ -230,53 +554,31 @@ async def create_job(
             
             # Save uploaded file
             video_path = job_dir / "input_video.mp4"
-            with open(video_path, "wb") as f:
-                content = await file.read()
-                if len(content) > MAX_UPLOAD_SIZE:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE // (1024*1024)}MB"
-                    )
-                f.write(content)
+            await save_upload(file, video_path)
             
-            # Extract frames
-            frame_count = extract_frames_from_video(str(video_path), str(input_dir))
+            # Count frames
+            frame_count = await count_frames(video_path)
             
         elif video_url:
             # Download video from URL
-            import httpx
-            
             video_path = job_dir / "input_video.mp4"
-            async with httpx.AsyncClient() as client:
-                response = await client.get(video_url, follow_redirects=True)
-                response.raise_for_status()
-                
-                content = response.content
-                if len(content) > MAX_UPLOAD_SIZE:
-                    raise HTTPException(
-                        status_code=400,
-                        detail=f"File too large. Maximum size is {MAX_UPLOAD_SIZE // (1024*1024)}MB"
-                    )
-                
-                with open(video_path, "wb") as f:
-                    f.write(content)
+            await download_video(video_url, video_path)
             
-            # Extract frames
-            frame_count = extract_frames_from_video(str(video_path), str(input_dir))
+            # Count frames
+            frame_count = await count_frames(video_path)
         
         # Validate frame count
         if frame_count < 16:
-            shutil.rmtree(job_dir)
             raise HTTPException(
                 status_code=400,
-                detail=f"Video too short: {frame_count} frames extracted. ActionMesh requires at least 16 frames."
+                detail=f"Video too short: {frame_count} frames. ActionMesh requires at least 16 frames."
             )
         
         # Create job record
         job = job_store.create(job_id)
         
-        # Start background processing
-        background_tasks.add_task(process_job, job_id, mode, blender_export)
+        # Hand off to the job workers
+        await app.state.job_queue.put((job_id, mode, blender_export))
         
         return JobResponse(
             job_id=job_id,
@@ -284,18 +586,31 @@ async def create_job(
         )
         
     except HTTPException:
+        # Cleanup partial uploads and rejected videos
+        await asyncio.to_thread(shutil.rmtree, job_dir, ignore_errors=True)
         raise
     except Exception as e:
         # Cleanup on error
-        if job_dir.exists():
-            shutil.rmtree(job_dir)
+        await asyncio.to_thread(shutil.rmtree, job_dir, ignore_errors=True)
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @app.get("/jobs/{job_id}", response_model=JobResponse)
-async def get_job_status(job_id: str):
-    """Get the status of a processing job."""
-    job = job_store.get(job_id)
+async def get_job_status(
+    job_id: str,
+    wait: float = Query(0, ge=0),
+):
+    """
+    Get the status of a processing job.
+    
+    With wait > 0 the request is held open until the job's status changes
+    (or it finishes), returning after at most that many seconds (capped at
+    MAX_POLL_WAIT), so clients can long-poll instead of polling repeatedly.
+    """
+    if wait > 0:
+        job = await job_store.wait_for_change(job_id, min(wait, MAX_POLL_WAIT))
+    else:
+        job = job_store.get(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
@@ -307,8 +622,37 @@ async def get_job_status(job_id: str):
     )
 
 
+@app.get("/outputs/{job_id}/meshes.zip")
+async def download_meshes_archive(job_id: str, request: Request):
+    """Download all per-frame meshes as a ZIP archive."""
+    job = job_store.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != JobStatus.FINISHED:
+        raise HTTPException(status_code=400, detail="Job not finished")
+    
+    # Normally prebuilt by process_job; build it now for jobs that predate that
+    zip_path = job.archive_path
+    if not zip_path:
+        zip_path = str(JOBS_DIR / job_id / "meshes.zip")
+        mesh_crcs = await asyncio.to_thread(build_meshes_archive, job.mesh_files, zip_path)
+        job_store.update(job_id, mesh_crcs=mesh_crcs, archive_path=zip_path)
+    
+    stat_result = await asyncio.to_thread(os.stat, zip_path)
+    response = FileResponse(
+        path=zip_path,
+        filename=f"meshes_{job_id[:8]}.zip",
+        media_type="application/zip",
+        stat_result=stat_result,
+        headers=IMMUTABLE_CACHE_HEADERS,
+    )
+    if etag_matches(request, response.headers["etag"]):
+        return not_modified(response.headers["etag"])
+    return response
+
+
 @app.get("/outputs/{job_id}/{filename}")
-async def download_output(job_id: str, filename: str):
+async def download_output(job_id: str, filename: str, request: Request):
     """Download an output file from a completed job."""
     # Validate job exists and is finished
     job = job_store.get(job_id)
@@ -321,50 +665,33 @@ async def download_output(job_id: str, filename: str):
     if ".." in filename or "/" in filename:
         raise HTTPException(status_code=400, detail="Invalid filename")
     
+    # Stat off the event loop; FileResponse reuses the result instead of re-statting
     file_path = JOBS_DIR / job_id / "output" / filename
-    if not file_path.exists():
+    try:
+        stat_result = await asyncio.to_thread(os.stat, file_path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="File not found")
     
     # Determine media type
-    media_type = "application/octet-stream"
-    if filename.endswith(".glb"):
-        media_type = "model/gltf-binary"
-    elif filename.endswith(".mp4"):
-        media_type = "video/mp4"
-    elif filename.endswith(".zip"):
-        media_type = "application/zip"
+    extension = os.path.splitext(filename)[1].lower()
+    media_type = MEDIA_TYPES.get(extension, "application/octet-stream")
     
-    return FileResponse(
+    # Per-frame meshes use their CRC-32 from the archive build as a strong ETag;
+    # other files keep FileResponse's default
+    headers = dict(IMMUTABLE_CACHE_HEADERS)
+    if filename in job.mesh_crcs:
+        headers["ETag"] = f'"{job.mesh_crcs[filename]}"'
+    
+    response = FileResponse(
         path=file_path,
         filename=filename,
         media_type=media_type,
+        stat_result=stat_result,
+        headers=headers,
     )
-
-
-@app.get("/outputs/{job_id}/meshes.zip")
-async def download_meshes_archive(job_id: str):
-    """Download all per-frame meshes as a ZIP archive."""
-    job = job_store.get(job_id)
-    if not job:
-        raise HTTPException(status_code=404, detail="Job not found")
-    if job.status != JobStatus.FINISHED:
-        raise HTTPException(status_code=400, detail="Job not finished")
-    
-    output_dir = JOBS_DIR / job_id / "output"
-    zip_path = JOBS_DIR / job_id / "meshes.zip"
-    
-    # Create zip if it doesn't exist
-    if not zip_path.exists():
-        import zipfile
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for mesh_file in sorted(output_dir.glob("mesh_*.glb")):
-                zipf.write(mesh_file, mesh_file.name)
-    
-    return FileResponse(
-        path=zip_path,
-        filename=f"meshes_{job_id[:8]}.zip",
-        media_type="application/zip",
-    )
+    if etag_matches(request, response.headers["etag"]):
+        return not_modified(response.headers["etag"])
+    return response
 
 
 @app.delete("/jobs/{job_id}")
@@ -378,10 +705,8 @@ async def delete_job(job_id: str):
     if job.status == JobStatus.RUNNING:
         raise HTTPException(status_code=400, detail="Cannot delete running job")
     
-    # Remove files
-    job_dir = JOBS_DIR / job_id
-    if job_dir.exists():
-        shutil.rmtree(job_dir)
+    # Remove files in the background
+    app.state.cleanup_queue.put_nowait(JOBS_DIR / job_id)
     
     # Remove from store
     job_store.delete(job_id)